@@ -1,19 +1,91 @@
-const { app, BrowserWindow, shell } = require('electron');
+const { app, BrowserWindow, nativeImage, shell } = require('electron');
 const path = require('path');
 
+// Main window and OAuth popups share one persistent session (cookies + disk cache)
+const PARTITION = 'persist:claude';
+const CLAUDE_URL = 'https://claude.ai/';
+
+// Sign-in hosts (and their subdomains) whose popups must open in-app so the
+// session cookies land in persist:claude; SSO flows start on claude.ai
+const OAUTH_HOSTS = new Set([
+  'claude.ai',
+  'anthropic.com',
+  'accounts.google.com',
+  'appleid.apple.com',
+  'login.microsoftonline.com',
+  'login.live.com'
+]);
+
+// Give the shared HTTP disk cache an explicit 256 MB budget so claude.ai's
+// JS/CSS bundles survive across launches
+app.commandLine.appendSwitch('disk-cache-size', String(256 * 1024 * 1024));
+
+// Skip scroll animation paints; CLAUDE_DESKTOP_SMOOTH_SCROLL=1 or
+// --enable-smooth-scrolling keeps the animated scrolling
+const smoothScrollOptIn = process.env.CLAUDE_DESKTOP_SMOOTH_SCROLL === '1' ||
+  app.commandLine.hasSwitch('enable-smooth-scrolling');
+if (!smoothScrollOptIn) {
+  app.commandLine.appendSwitch('disable-smooth-scrolling');
+}
+
+// Rasterize on the GPU and skip the CPU copy when uploading tiles; Chromium
+// leaves both off by default on many Linux desktops. enable-gpu-rasterization
+// overrides the GPU blocklist, so users on broken drivers can opt out with
+// CLAUDE_DESKTOP_NO_GPU_RASTER=1, --disable-gpu-rasterization or --disable-gpu
+const gpuRasterOptOut = process.env.CLAUDE_DESKTOP_NO_GPU_RASTER === '1' ||
+  app.commandLine.hasSwitch('disable-gpu-rasterization') ||
+  app.commandLine.hasSwitch('disable-gpu');
+if (!gpuRasterOptOut) {
+  app.commandLine.appendSwitch('enable-gpu-rasterization');
+  app.commandLine.appendSwitch('enable-zero-copy');
+}
+
 let mainWindow;
+let appIcon;
+
+// Decode icon.png once and hand the same image to every window
+function getAppIcon() {
+  if (!appIcon) {
+    appIcon = nativeImage.createFromPath(path.join(__dirname, 'icon.png'));
+  }
+  return appIcon;
+}
+
+function isOAuthHost(hostname) {
+  // Walk up the domain labels so 'x.accounts.google.com' matches but
+  // 'accounts.google.com.evil.net' does not. A fully qualified name keeps its
+  // trailing dot in URL.hostname, so drop it first
+  let host = hostname.endsWith('.') ? hostname.slice(0, -1) : hostname;
+  while (host) {
+    if (OAUTH_HOSTS.has(host)) return true;
+    const dot = host.indexOf('.');
+    if (dot === -1) break;
+    host = host.slice(dot + 1);
+  }
+  return false;
+}
+
+function isOAuthUrl(url) {
+  let hostname;
+  try {
+    hostname = new URL(url).hostname;
+  } catch {
+    return false;
+  }
+  return isOAuthHost(hostname);
+}
 
 function createWindow() {
   mainWindow = new BrowserWindow({
     width: 1400,
     height: 900,
     title: 'Claude Desktop',
-    icon: path.join(__dirname, 'icon.png'),
+    icon: getAppIcon(),
     webPreferences: {
       nodeIntegration: false,
       contextIsolation: true,
       sandbox: true,
-      partition: 'persist:claude'
+      partition: PARTITION
     }
   });
 
@@ -22,16 +94,14 @@ function createWindow() {
 
   // Handle OAuth popups - THIS IS THE KEY!
   mainWindow.webContents.setWindowOpenHandler(({ url }) => {
-    if (url.includes('accounts.google.com') || 
-        url.includes('oauth') ||
-        url.includes('login')) {
+    if (isOAuthUrl(url)) {
       return {
         action: 'allow',
         overrideBrowserWindowOptions: {
           width: 500,
           height: 700,
-          icon: path.join(__dirname, 'icon.png'),
-          webPreferences: { partition: 'persist:claude' }
+          icon: getAppIcon(),
+          webPreferences: { partition: PARTITION }
         }
       };
     }
@@ -39,13 +109,28 @@ function createWindow() {
     return { action: 'deny' };
   });
 
-  mainWindow.loadURL('https://claude.ai/');
+  mainWindow.loadURL(CLAUDE_URL);
   mainWindow.on('closed', () => { mainWindow = null; });
   
   console.log('✓ Claude Desktop started - Google OAuth fully supported!');
 }
 
-app.whenReady().then(createWindow);
+// A second launch focuses the running window instead of booting another
+// Chromium process tree against the same profile
+if (!app.requestSingleInstanceLock()) {
+  app.quit();
+} else {
+  app.on('second-instance', () => {
+    if (!mainWindow) {
+      createWindow();
+      return;
+    }
+    if (mainWindow.isMinimized()) mainWindow.restore();
+    mainWindow.focus();
+  });
+  app.whenReady().then(createWindow);
+}
+
 app.on('window-all-closed', () => {
   if (process.platform !== 'darwin') app.quit();
 });